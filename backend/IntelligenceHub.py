@@ -1,7 +1,13 @@
 import os
-import json
-import requests
+import orjson
+import asyncio
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import httpx
 from datetime import datetime
+from functools import lru_cache
+from itertools import islice
 from dotenv import load_dotenv
 from agno.agent import Agent
 import logging
@@ -10,8 +16,14 @@ from agno.models.google import Gemini
 from agno.db.postgres import PostgresDb
 from agno.memory import MemoryManager
 from fastapi.middleware.cors import CORSMiddleware
-import feedparser
+from sqlalchemy import create_engine
+import uvicorn
+from cachetools import LRUCache, TTLCache
+import redis.asyncio as redis
+from lxml import etree
+import ahocorasick
 import re
+from urllib.parse import quote_plus
 
 load_dotenv()
 
@@ -21,393 +33,823 @@ logger = logging.getLogger(__name__)
 NEWSAPI_API_KEY = os.getenv("NEWSAPI_API_KEY")
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 NEON_DB_URL = os.getenv("NEON_DB_URL")
+# Neon's PgBouncer endpoint (the "-pooler" host, transaction mode). Preferred when set so
+# every uvicorn worker's pool multiplexes onto a few server connections.
+NEON_POOLER_URL = os.getenv("NEON_POOLER_URL")
 COINGECKO_API_KEY = os.getenv("COINGECKO_API_KEY")
+REDIS_URL = os.getenv("REDIS_URL")
 
-storage = PostgresDb(db_url=NEON_DB_URL, memory_table="agent_memory")
+# retries=2 on the transport covers connection failures; http_get below retries
+# the rate-limit/gateway statuses that CoinGecko and the feeds hand out under load.
+HTTP = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=2,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60),
+    ),
+    timeout=10,
+    follow_redirects=True,
+    # Some feed hosts throttle or reject httpx's default User-Agent; gzip keeps RSS bodies small.
+    headers={
+        "User-Agent": "CryptoIntelligenceHub/1.0 (+https://crypto-intelligence-agent.vercel.app)",
+        "Accept-Encoding": "gzip, deflate",
+    },
+)
+RETRY_STATUSES = {429, 502, 503, 504}
+# RSS hosts are a best-effort fallback; don't let a slow one hold up the merged news result.
+FEED_TIMEOUT = 5
+
+async def http_get(url: str, timeout: float = 10, headers: dict = None) -> httpx.Response:
+    """
+    GET through the shared client, retrying twice with a short backoff on RETRY_STATUSES.
+    """
+    for attempt in range(3):
+        response = await HTTP.get(url, timeout=timeout, headers=headers)
+        if response.status_code not in RETRY_STATUSES or attempt == 2:
+            return response
+        await asyncio.sleep(0.2 * 2 ** attempt)
+
+# Prices move on a ~10-30s timescale and RSS feeds update every few minutes,
+# so short-lived caches keep repeat lookups off CoinGecko's rate limit.
+_price_cache = TTLCache(maxsize=512, ttl=15)
+_feed_cache = TTLCache(maxsize=128, ttl=120)
+_news_cache = TTLCache(maxsize=256, ttl=300)
+_coin_id_cache = TTLCache(maxsize=1024, ttl=86400)
+# url -> (etag, last_modified, parsed entries) for feeds that send validators, so an expired
+# _feed_cache entry can be revalidated with a conditional GET instead of re-downloaded.
+# Raw bodies are never kept here, only entries that were actually parsed.
+_feed_validators = LRUCache(maxsize=64)
+
+# Optional shared cache so every worker/instance reuses the same CoinGecko and news
+# results. Without REDIS_URL, or when Redis is unreachable, lookups just fall through.
+redis_client = redis.from_url(REDIS_URL) if REDIS_URL else None
+
+async def cache_get(key: str):
+    if redis_client is None:
+        return None
+    try:
+        return await redis_client.get(key)
+    except Exception as e:
+        logger.warning(f"Redis get failed for {key}: {e}")
+        return None
+
+async def cache_set(key: str, ttl: int, value) -> None:
+    if redis_client is None:
+        return
+    try:
+        await redis_client.setex(key, ttl, value)
+    except Exception as e:
+        logger.warning(f"Redis set failed for {key}: {e}")
+
+# CoinGecko's demo tier allows ~30 calls/minute. The semaphore bounds this worker's
+# in-flight calls; the Redis counter shares the per-minute budget across workers.
+CG_SEM = asyncio.Semaphore(4)
+CG_CALLS_PER_MINUTE = 28
+CG_MAX_WAIT = 15
+
+class RateLimitExceeded(Exception):
+    pass
+
+async def coingecko_get(url: str) -> httpx.Response:
+    if redis_client is not None:
+        deadline = time.time() + CG_MAX_WAIT
+        while True:
+            try:
+                key = f"cg:bucket:{int(time.time() // 60)}"
+                calls = await redis_client.incr(key)
+                if calls == 1:
+                    await redis_client.expire(key, 60)
+            except Exception as e:
+                logger.warning(f"Redis rate limiter unavailable: {e}")
+                break
+            if calls <= CG_CALLS_PER_MINUTE:
+                break
+            # Over budget: wait for the next minute and claim a slot there, so deferred
+            # calls don't all fire together on top of that minute's own budget.
+            wait = 60 - time.time() % 60
+            if time.time() + wait > deadline:
+                raise RateLimitExceeded("CoinGecko rate limit reached, try again in a minute")
+            await asyncio.sleep(wait)
+
+
+    async with CG_SEM:
+        return await http_get(url)
+
+@lru_cache(maxsize=2)
+def _iso_for_second(sec: int) -> str:
+    return datetime.fromtimestamp(sec).isoformat()
+
+def _now_iso() -> str:
+    """
+    Current local time as naive ISO-8601 (the format already stored in memories),
+    formatted once per wall-clock second so a burst of tool results shares one
+    consistent timestamp.
+    """
+    return _iso_for_second(int(time.time()))
+
+# One pooled engine shared by every request: Neon's TCP+TLS+auth handshake costs far
+# more than the memory queries themselves. pre_ping/recycle cover Neon suspending idle
+# computes and dropping their connections. TLS mode comes from the URL (`?sslmode=...`).
+db_engine = create_engine(
+    NEON_POOLER_URL or NEON_DB_URL,
+    pool_size=2,
+    max_overflow=8,
+    pool_pre_ping=True,
+    pool_recycle=300,
+    connect_args={"keepalives": 1, "keepalives_idle": 30},
+)
+
+storage = PostgresDb(db_engine=db_engine, memory_table="agent_memory")
+
+# One client per model id for the agents; the memory manager takes its own copy.
+GEMINI_FLASH = Gemini(id='gemini-2.5-flash', api_key=GOOGLE_API_KEY)
+GEMINI_PRO = Gemini(
+    id='gemini-2.5-pro', 
+    api_key=GOOGLE_API_KEY,
+    temperature=0.1, 
+    top_p=0.8,
+    stop_sequences=["---END---", "\n\nIs there"],
+)
 
 memory_manager = MemoryManager(
     db=storage,
-    model=Gemini(id='gemini-2.5-flash', api_key=GOOGLE_API_KEY),
+    model=GEMINI_FLASH,
     additional_instructions="Always store the price and timestamp when fetching crypto prices. DO NOT STORE news articles or any other data.",
 )
 
-def get_crypto_price(symbol: str) -> str:
+_SYMBOL_MAP = {
+    'btc': 'bitcoin',
+    'eth': 'ethereum',
+    'bnb': 'binancecoin',
+    'xrp': 'ripple',
+    'ada': 'cardano',
+    'doge': 'dogecoin',
+    'sol': 'solana',
+    'dot': 'polkadot',
+    'matic': 'matic-network',
+    'shib': 'shiba-inu',
+    'avax': 'avalanche-2',
+    'pi': 'pi-network',
+    'trx': 'tron',
+    'link': 'chainlink',
+    'atom': 'cosmos',
+    'uni': 'uniswap',
+    'etc': 'ethereum-classic',
+    'ltc': 'litecoin',
+    'bch': 'bitcoin-cash',
+    'xlm': 'stellar',
+    'algo': 'algorand',
+}
+_CANONICAL_IDS = frozenset(_SYMBOL_MAP.values())
+
+def candidate_ids(symbol: str) -> list:
     """
-    Fetch the latest USD price of a cryptocurrency from CoinGecko.
-    Args:
-        symbol (str): The name/id of the crypto (e.g., 'bitcoin', 'ethereum', 'pi-network').
-    Returns:
-        str: JSON string with price info.
+    Build the CoinGecko ids worth trying for a user-supplied symbol, most likely first.
     """
+    symbol_lower = symbol.lower().strip()
     
-    symbol_mappings = {
-        'btc': 'bitcoin',
-        'eth': 'ethereum',
-        'bnb': 'binancecoin',
-        'xrp': 'ripple',
-        'ada': 'cardano',
-        'doge': 'dogecoin',
-        'sol': 'solana',
-        'dot': 'polkadot',
-        'matic': 'matic-network',
-        'shib': 'shiba-inu',
-        'avax': 'avalanche-2',
-        'pi': 'pi-network',
-        'trx': 'tron',
-        'link': 'chainlink',
-        'atom': 'cosmos',
-        'uni': 'uniswap',
-        'etc': 'ethereum-classic',
-        'ltc': 'litecoin',
-        'bch': 'bitcoin-cash',
-        'xlm': 'stellar',
-        'algo': 'algorand',
-    }
+    if symbol_lower in _SYMBOL_MAP:
+        symbol_lower = _SYMBOL_MAP[symbol_lower]
     
-    original_symbol = symbol
-    symbol_lower = symbol.lower().strip()
+    # Known-good ids need no speculative spellings in the batched request.
+    if symbol_lower in _CANONICAL_IDS:
+        return [symbol_lower]
     
-    if symbol_lower in symbol_mappings:
-        symbol_lower = symbol_mappings[symbol_lower]
+    candidates = [symbol_lower]
+    if '-' in symbol_lower or ' ' in symbol_lower:
+        for candidate in (symbol_lower.replace(' ', '-'), symbol_lower.replace('-', '').replace(' ', '')):
+            if candidate not in candidates:
+                candidates.append(candidate)
     
-    symbol_variations = [
-        symbol_lower,
-        symbol_lower.replace(' ', '-'),
-        symbol_lower.replace('-', ''),
-        symbol_lower + '-network' if 'network' not in symbol_lower else symbol_lower,
-    ]
+    return candidates
+
+async def fetch_usd_prices(ids: list) -> dict:
+    """
+    Fetch USD prices for several CoinGecko ids with a single /simple/price call.
+    Returns a mapping of id -> price for the ids CoinGecko knows about.
+    """
+    url = f"https://api.coingecko.com/api/v3/simple/price?ids={','.join(ids)}&vs_currencies=usd&x_cg_demo_api_key={COINGECKO_API_KEY}"
+    response = await coingecko_get(url)
     
-    symbol_variations = list(dict.fromkeys(symbol_variations))
+    if response.status_code != 200:
+        return {}
     
+    data = orjson.loads(response.content)
+    prices = {}
+    for coin_id in ids:
+        price = data.get(coin_id, {}).get("usd")
+        if price:
+            prices[coin_id] = price
+    return prices
+
+def pick_price(symbol: str, symbol_variations: list, prices: dict, name: str = None) -> dict:
+    """
+    Pick one symbol's price out of a batched lookup, taking the first variation CoinGecko knew.
+    `name` is the display name remembered from an earlier search, if any.
+    """
     for symbol_id in symbol_variations:
-        try:
-            url = f"https://api.coingecko.com/api/v3/simple/price?ids={symbol_id}&vs_currencies=usd&x_cg_demo_api_key={COINGECKO_API_KEY}"
-            response = requests.get(url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
-                price = data.get(symbol_id, {}).get("usd")
-                
-                if price:
-                    return json.dumps({
-                        "symbol": original_symbol.upper(),
-                        "price_usd": price,
-                        "coingecko_id": symbol_id,
-                        "timestamp": datetime.now().isoformat()
-                    })
-        except Exception:
-            continue
-    
+        if symbol_id in prices:
+            return {
+                "symbol": name or symbol.upper(),
+                "price_usd": prices[symbol_id],
+                "coingecko_id": symbol_id,
+            }
+    return None
+
+async def search_coin(symbol: str) -> dict:
+    """
+    Resolve a symbol none of the variations matched through CoinGecko search.
+    Returns {"id": ..., "name": ...} for the top hit, or None.
+    """
     try:
-        search_url = f"https://api.coingecko.com/api/v3/search?query={original_symbol}&x_cg_demo_api_key={COINGECKO_API_KEY}"
-        search_response = requests.get(search_url, timeout=10)
+        search_url = f"https://api.coingecko.com/api/v3/search?query={symbol}&x_cg_demo_api_key={COINGECKO_API_KEY}"
+        search_response = await coingecko_get(search_url)
         
         if search_response.status_code == 200:
-            search_data = search_response.json()
+            search_data = orjson.loads(search_response.content)
             coins = search_data.get("coins", [])
             
             if coins:
-                coin_id = coins[0].get("id")
-                coin_name = coins[0].get("name")
+                coin = {"id": coins[0].get("id"), "name": coins[0].get("name")}
                 
-                price_url = f"https://api.coingecko.com/api/v3/simple/price?ids={coin_id}&vs_currencies=usd&x_cg_demo_api_key={COINGECKO_API_KEY}"
-                price_response = requests.get(price_url, timeout=10)
-                
-                if price_response.status_code == 200:
-                    price_data = price_response.json()
-                    price = price_data.get(coin_id, {}).get("usd")
-                    
-                    if price:
-                        return json.dumps({
-                            "symbol": coin_name,
-                            "price_usd": price,
-                            "coingecko_id": coin_id,
-                            "timestamp": datetime.now().isoformat()
-                        })
+                # Search results for a symbol practically never change; remember them so
+                # later lookups go straight to the batched price call.
+                _coin_id_cache[symbol.lower().strip()] = coin
+                await cache_set(f"cg:id:{symbol.lower().strip()}", 86400, orjson.dumps(coin))
+                return coin
+    except RateLimitExceeded:
+        raise
     except Exception as e:
         pass
     
-    return json.dumps({
-        "error": f"Could not find price for '{original_symbol}'. Please try using the full CoinGecko ID (e.g., 'bitcoin', 'ethereum', 'pi-network').",
+    return None
+
+def price_error(symbol: str, symbol_variations: list) -> dict:
+    return {
+        "error": f"Could not find price for '{symbol}'. Please try using the full CoinGecko ID (e.g., 'bitcoin', 'ethereum', 'pi-network').",
         "tried_variations": symbol_variations[:3],
         "suggestion": "You can search for the correct ID at https://www.coingecko.com/"
-    })
+    }
 
-def get_crypto_news(symbol: str, num_stories: int = 3) -> str:
+async def lookup_prices(symbols: list) -> dict:
     """
-    Fetch latest crypto news with advanced relevance filtering to avoid false positives.
+    Resolve prices for several symbols, sharing one batched CoinGecko call for every
+    candidate id of every symbol that is not already cached.
     """
-    stories = []
-    seen_urls = set()
-    clean_symbol = symbol.replace('-', ' ')
+    results = {}
+    pending = {}
     
-    crypto_keywords = [
-        'cryptocurrency', 'crypto', 'blockchain', 'token', 'coin',
-        'bitcoin', 'ethereum', 'trading', 'exchange', 'wallet',
-        'price', 'market', 'defi', 'nft', 'mining', 'staking',
-        'bull', 'bear', 'rally', 'dump', 'pump', 'hodl',
-        'binance', 'coinbase', 'kraken', 'uniswap', 'dex',
-        'altcoin', 'memecoin', 'web3', 'satoshi', 'ledger',
-        'buy', 'sell', 'trade', 'invest', 'capitalization'
-    ]
+    for symbol in symbols:
+        cached = _price_cache.get(symbol.lower().strip())
+        if cached:
+            results[symbol] = cached
+        else:
+            pending[symbol] = candidate_ids(symbol)
     
-    false_positive_indicators = [
-        'country', 'nation', 'government', 'politics', 'election',
-        'tourism', 'geography', 'city', 'capital', 'president',
-        'flower', 'plant', 'garden', 'nature', 'species',
-        'movie', 'film', 'actor', 'actress', 'director',
-        'restaurant', 'food', 'recipe', 'cooking', 'chef'
+    shared = await asyncio.gather(*(cache_get(f"cg:price:{symbol.lower().strip()}") for symbol in pending))
+    for symbol, cached in zip(list(pending), shared):
+        if cached:
+            results[symbol] = _price_cache[symbol.lower().strip()] = orjson.loads(cached)
+            del pending[symbol]
+    
+    names = {}
+    # Mapped tickers and canonical ids already resolve to one known id; only the rest
+    # can have a remembered search result worth a Redis round-trip.
+    unknown = [
+        symbol for symbol in pending
+        if symbol.lower().strip() not in _coin_id_cache and pending[symbol][0] not in _CANONICAL_IDS
     ]
+    known_ids = await asyncio.gather(*(cache_get(f"cg:id:{symbol.lower().strip()}") for symbol in unknown))
+    for symbol, known in zip(unknown, known_ids):
+        if known:
+            _coin_id_cache[symbol.lower().strip()] = orjson.loads(known)
+    
+    for symbol in pending:
+        coin = _coin_id_cache.get(symbol.lower().strip())
+        if coin:
+            pending[symbol] = [coin["id"]]
+            names[symbol] = coin["name"]
     
-    def is_crypto_relevant(text: str, symbol: str) -> bool:
-        """
-        Advanced relevance check for cryptocurrency articles.
-        Filters out false positives like "Oasis (country)" vs "Oasis Network (crypto)"
-        """
-        text_lower = text.lower()
-        symbol_lower = symbol.lower()
-        clean_symbol_lower = clean_symbol.lower()
+    if pending:
+        rate_limited = None
+        try:
+            prices = await fetch_usd_prices(sorted({symbol_id for variations in pending.values() for symbol_id in variations}))
+        except RateLimitExceeded as e:
+            rate_limited = e
+            prices = {}
+        except Exception as e:
+            logger.error(f"CoinGecko batch price error: {e}")
+            prices = {}
         
-        symbol_pattern = r"\b" + re.escape(symbol_lower) + r"\b"
-        clean_symbol_pattern = r"\b" + re.escape(clean_symbol_lower) + r"\b"
+        resolved = {}
+        for symbol, variations in pending.items():
+            result = pick_price(symbol, variations, prices, names.get(symbol))
+            if result:
+                resolved[symbol] = result
+        
+        # Symbols no variation matched are searched concurrently, then priced together
+        # in one more batched call.
+        misses = [] if rate_limited else [symbol for symbol in pending if symbol not in resolved]
+        coins = await asyncio.gather(*(search_coin(symbol) for symbol in misses), return_exceptions=True)
+        for coin in coins:
+            if isinstance(coin, RateLimitExceeded):
+                rate_limited = coin
+        found = {symbol: coin for symbol, coin in zip(misses, coins) if isinstance(coin, dict)}
+        if found:
+            try:
+                prices = await fetch_usd_prices(sorted({coin["id"] for coin in found.values()}))
+            except RateLimitExceeded as e:
+                rate_limited = e
+                prices = {}
+            except Exception as e:
+                logger.error(f"CoinGecko batch price error: {e}")
+                prices = {}
+            for symbol, coin in found.items():
+                result = pick_price(symbol, [coin["id"]], prices, coin["name"])
+                if result:
+                    resolved[symbol] = result
         
-        if not (re.search(symbol_pattern, text_lower) or re.search(clean_symbol_pattern, text_lower)):
+        if rate_limited:
+            logger.warning(f"{rate_limited}")
+        
+        for symbol, variations in pending.items():
+            result = resolved.get(symbol) or ({"error": str(rate_limited)} if rate_limited else price_error(symbol, variations))
+            if "error" not in result:
+                _price_cache[symbol.lower().strip()] = result
+                await cache_set(f"cg:price:{symbol.lower().strip()}", 45, orjson.dumps(result))
+            results[symbol] = result
+    
+    timestamp = _now_iso()
+    return {
+        symbol: result if "error" in result else {**result, "timestamp": timestamp}
+        for symbol, result in results.items()
+    }
+
+async def get_crypto_prices(symbols: list[str]) -> str:
+    """
+    Fetch the latest USD prices of several cryptocurrencies from CoinGecko in one call.
+    Args:
+        symbols (list[str]): The names/ids of the cryptos (e.g., ['bitcoin', 'eth', 'solana']).
+    Returns:
+        str: JSON string mapping each requested symbol to its price info.
+    """
+    return orjson.dumps(await lookup_prices(symbols)).decode()
+
+async def get_crypto_price(symbol: str) -> str:
+    """
+    Fetch the latest USD price of a cryptocurrency from CoinGecko.
+    Args:
+        symbol (str): The name/id of the crypto (e.g., 'bitcoin', 'ethereum', 'pi-network').
+    Returns:
+        str: JSON string with price info.
+    """
+    return orjson.dumps((await lookup_prices([symbol]))[symbol]).decode()
+
+crypto_keywords = frozenset([
+    'cryptocurrency', 'crypto', 'blockchain', 'token', 'coin',
+    'bitcoin', 'ethereum', 'trading', 'exchange', 'wallet',
+    'price', 'market', 'defi', 'nft', 'mining', 'staking',
+    'bull', 'bear', 'rally', 'dump', 'pump', 'hodl',
+    'binance', 'coinbase', 'kraken', 'uniswap', 'dex',
+    'altcoin', 'memecoin', 'web3', 'satoshi', 'ledger',
+    'buy', 'sell', 'trade', 'invest', 'capitalization'
+])
+
+false_positive_indicators = frozenset([
+    'country', 'nation', 'government', 'politics', 'election',
+    'tourism', 'geography', 'city', 'capital', 'president',
+    'flower', 'plant', 'garden', 'nature', 'species',
+    'movie', 'film', 'actor', 'actress', 'director',
+    'restaurant', 'food', 'recipe', 'cooking', 'chef'
+])
+
+# One automaton over both keyword lists finds every (overlapping) substring hit in a
+# single pass over the article, instead of one `in` scan per keyword.
+def _build_keyword_automaton() -> ahocorasick.Automaton:
+    automaton = ahocorasick.Automaton()
+    for keyword in crypto_keywords:
+        automaton.add_word(keyword, (True, keyword))
+    for keyword in false_positive_indicators:
+        automaton.add_word(keyword, (False, keyword))
+    automaton.make_automaton()
+    return automaton
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+_TAG_RE = re.compile(r"<[^<]+?>")
+
+def _truncate(s: str, n: int = 200) -> str:
+    return (s[:n] + "...") if s and len(s) > n else (s or "")
+
+def _strip_tags(raw: str, cap: int = 1024) -> str:
+    # Slice before stripping: descriptions end up clipped to 200 chars and some feeds
+    # ship whole HTML articles, which the non-greedy tag regex would otherwise walk.
+    return _TAG_RE.sub("", raw[:cap])
+
+crypto_feeds = [
+    "https://cointelegraph.com/rss",
+    "https://news.bitcoin.com/feed/",
+    "https://cryptonews.net/en/news/feed/",
+    "https://www.coindesk.com/arc/outboundfeeds/rss/"
+]
+
+@lru_cache(maxsize=256)
+def _symbol_patterns(symbol_lower: str) -> tuple:
+    """
+    Word-boundary patterns for a symbol and its de-hyphenated form, compiled once per symbol.
+    """
+    clean_symbol_lower = symbol_lower.replace('-', ' ')
+    return (
+        re.compile(r"\b" + re.escape(symbol_lower) + r"\b"),
+        re.compile(r"\b" + re.escape(clean_symbol_lower) + r"\b"),
+    )
+
+def is_crypto_relevant(text: str, symbol: str, lowered: bool = False) -> bool:
+    """
+    Advanced relevance check for cryptocurrency articles.
+    Filters out false positives like "Oasis (country)" vs "Oasis Network (crypto)"
+    Pass lowered=True when `text` is already lower-cased.
+    """
+    text_lower = text if lowered else text.lower()
+    symbol_lower = symbol.lower()
+    
+    # Most candidates from broad searches never mention the symbol at all; a plain
+    # substring probe rejects them before any regex runs.
+    if symbol_lower not in text_lower and symbol_lower.replace('-', ' ') not in text_lower:
+        return False
+    
+    symbol_pattern, clean_symbol_pattern = _symbol_patterns(symbol_lower)
+    
+    symbol_count = len(symbol_pattern.findall(text_lower)) + len(clean_symbol_pattern.findall(text_lower))
+    if not symbol_count:
+        return False
+    
+    # Scoring system:
+    # High confidence: Multiple symbol mentions OR single mention with strong crypto context
+    # Reject: Single mention with false positive indicators and no crypto context
+    
+    if symbol_count >= 2:
+        return True
+    
+    crypto_hits = set()
+    has_false_positive = False
+    for _, (is_crypto, keyword) in _KEYWORD_AUTOMATON.iter(text_lower):
+        if is_crypto:
+            crypto_hits.add(keyword)
+        else:
+            has_false_positive = True
+    has_crypto_context = bool(crypto_hits)
+    
+    if symbol_count == 1:
+        if has_crypto_context and not has_false_positive:
+            return True
+        if has_crypto_context and has_false_positive:
+            return len(crypto_hits) >= 2
+        if has_false_positive and not has_crypto_context:
             return False
+    
+    return False
+
+# Feed parsing gets its own bounded pool so a burst of news requests cannot take over
+# the default executor that agno and asyncio.to_thread share.
+_FEED_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="feed-parse")
+
+# lxml parser objects must not be shared between threads, so each pool thread gets its own.
+_parser_local = threading.local()
+_ATOM = "{http://www.w3.org/2005/Atom}"
+
+def parse_rss(raw: bytes) -> list:
+    """
+    Extract the link/title/summary/published fields of every RSS item (or Atom entry).
+    Returns plain dicts so call sites can keep using entry.get(...).
+    """
+    parser = getattr(_parser_local, "parser", None)
+    if parser is None:
+        parser = _parser_local.parser = etree.XMLParser(recover=True, resolve_entities=False, no_network=True)
+    
+    try:
+        root = etree.fromstring(raw, parser)
+    except etree.XMLSyntaxError:
+        return []
+    if root is None:
+        return []
+    
+    entries = []
+    for item in root.iterfind(".//item"):
+        entry = {
+            "link": item.findtext("link"),
+            "title": item.findtext("title"),
+            "summary": item.findtext("description"),
+            "published": item.findtext("pubDate"),
+        }
+        entries.append(_present(entry))
+    
+    for item in root.iterfind(f".//{_ATOM}entry"):
+        link = item.find(f"{_ATOM}link")
+        entry = {
+            "link": link.get("href") if link is not None else None,
+            "title": item.findtext(f"{_ATOM}title"),
+            "summary": item.findtext(f"{_ATOM}summary") or item.findtext(f"{_ATOM}content"),
+            "published": item.findtext(f"{_ATOM}published") or item.findtext(f"{_ATOM}updated"),
+        }
+        entries.append(_present(entry))
+    
+    return entries
+
+def _present(entry: dict) -> dict:
+    # Like feedparser, leave out elements the item doesn't have so call-site
+    # defaults such as entry.get("title", "No title") still apply.
+    if entry["link"] is not None:
+        entry["link"] = entry["link"].strip()
+    return {key: value for key, value in entry.items() if value is not None}
+
+async def fetch_feed(url: str):
+    """
+    Download an RSS feed, reusing bodies fetched within the last two minutes and
+    revalidating older ones with If-None-Match/If-Modified-Since.
+    Returns a {"raw": bytes, "entries": list | None} record whose entries are parsed
+    lazily by parse_feed, or None when the feed could not be fetched.
+    """
+    feed = _feed_cache.get(url)
+    if feed is None:
+        etag, last_modified, entries = _feed_validators.get(url, (None, None, None))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        
+        response = await http_get(url, timeout=FEED_TIMEOUT, headers=headers)
+        if response.status_code == 304 and entries is not None:
+            feed = {"raw": None, "entries": entries, "validators": (etag, last_modified)}
+        elif response.status_code != 200:
+            return None
+        else:
+            _feed_validators.pop(url, None)
+            feed = {"raw": response.content, "entries": None, "validators": None}
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+            if etag or last_modified:
+                feed["validators"] = (etag, last_modified)
+        
+        _feed_cache[url] = feed
+    return feed
+
+async def parse_feed(url: str, keywords: tuple = ()) -> list:
+    """
+    Return a feed's parsed entries. When `keywords` are given and the raw body mentions
+    none of them, the feed is skipped without paying for the XML parse.
+    """
+    feed = await fetch_feed(url)
+    if feed is None:
+        return []
+    
+    if feed["entries"] is None:
+        if keywords:
+            raw_lower = feed["raw"].lower()
+            if not any(keyword.lower().encode() in raw_lower for keyword in keywords):
+                return []
+        
+        feed["entries"] = await asyncio.get_running_loop().run_in_executor(_FEED_EXECUTOR, parse_rss, feed["raw"])
+        feed["raw"] = None
+        if feed["validators"]:
+            _feed_validators[url] = (*feed["validators"], feed["entries"])
+    
+    return feed["entries"]
+
+async def fetch_google_news(q: str, symbol: str, num_stories: int) -> list:
+    entries = await parse_feed(f'https://news.google.com/rss/search?q={quote_plus(q)}&hl=en&gl=US&ceid=US:en')
+    stories = []
+    
+    for entry in islice(entries, max(num_stories, 0) * 4):
+        if len(stories) >= num_stories:
+            break
+
+        url = entry.get("link")
+        if not url:
+            continue
+
+        title = entry.get("title", "No title")
+        headline, sep, publisher = title.rpartition(" - ")
+        title, source = (headline, publisher) if sep else (title, "Google News")
+
+        desc = _strip_tags(entry.get("summary", title))
         
-        symbol_count = len(re.findall(symbol_pattern, text_lower)) + len(re.findall(clean_symbol_pattern, text_lower))
+        combined_text = f"{title} {desc}"
+        if not is_crypto_relevant(combined_text, symbol):
+            logger.debug(f"Filtered out: {title[:50]}... (not crypto-relevant)")
+            continue
         
-        has_crypto_context = any(keyword in text_lower for keyword in crypto_keywords)
+        stories.append((
+            title,
+            source,
+            url,
+            entry.get("published", ""),
+            _truncate(desc),
+        ))
+    
+    return stories
+
+async def fetch_newsapi(symbol: str, num_stories: int) -> list:
+    q = f'"{symbol}" (cryptocurrency OR crypto OR blockchain OR token)'
+    url = (f"https://newsapi.org/v2/everything?"
+           f"q={q}&sortBy=publishedAt&language=en&pageSize=30&apiKey={NEWSAPI_API_KEY}")
+    stories = []
+    
+    resp = await http_get(url)
+    if resp.status_code != 200:
+        return stories
+    
+    articles = orjson.loads(resp.content).get("articles", [])
+    for art in articles:
+        if len(stories) >= num_stories:
+            break
         
-        has_false_positive = any(indicator in text_lower for indicator in false_positive_indicators)
+        article_url = art.get("url")
+        if not article_url:
+            continue
         
-        # Scoring system:
-        # High confidence: Multiple symbol mentions OR single mention with strong crypto context
-        # Reject: Single mention with false positive indicators and no crypto context
+        desc = art.get("description") or ""
+        combined_text = f"{art.get('title', '')} {desc}"
         
-        if symbol_count >= 2:
-            return True
+        if not is_crypto_relevant(combined_text, symbol):
+            continue
         
-        if symbol_count == 1:
-            if has_crypto_context and not has_false_positive:
-                return True
-            if has_crypto_context and has_false_positive:
-                crypto_count = sum(1 for kw in crypto_keywords if kw in text_lower)
-                return crypto_count >= 2
-            if has_false_positive and not has_crypto_context:
-                return False
+        stories.append((
+            art.get("title", "No title"),
+            art.get("source", {}).get("name", "NewsAPI"),
+            article_url,
+            art.get("publishedAt", ""),
+            _truncate(desc),
+        ))
+    
+    return stories
+
+async def fetch_bing_news(symbol: str, num_stories: int) -> list:
+    entries = await parse_feed(f"https://www.bing.com/news/search?q={quote_plus(symbol)}+cryptocurrency&format=rss")
+    stories = []
+    
+    for entry in islice(entries, max(num_stories, 0) * 4):
+        if len(stories) >= num_stories:
+            break
         
-        return False
+        url = entry.get("link")
+        if not url:
+            continue
+        
+        title = entry.get("title", "No title")
+        desc = _strip_tags(entry.get("summary", ""))
+        
+        combined_text = f"{title} {desc}"
+        if not is_crypto_relevant(combined_text, symbol):
+            continue
+        
+        stories.append((
+            title,
+            "Bing News",
+            url,
+            entry.get("published", ""),
+            _truncate(desc),
+        ))
+    
+    return stories
+
+async def fetch_crypto_feed(feed_url: str, symbol: str, num_stories: int) -> list:
+    entries = await parse_feed(feed_url, keywords=(symbol, symbol.replace('-', ' ')))
+    stories = []
+    
+    for entry in islice(entries, max(num_stories, 0) * 5):
+        if len(stories) >= num_stories:
+            break
+        
+        entry_link = entry.get("link")
+        if not entry_link:
+            continue
+        
+        title = entry.get('title', '')
+        summary = entry.get('summary', '')
+        
+        # The shared crypto feeds are cached across requests for every symbol, so
+        # lower-case each entry's text once and keep it on the cached entry.
+        text_lower = entry.get("text_lower")
+        if text_lower is None:
+            text_lower = entry["text_lower"] = f"{title} {summary}".lower()
+        
+        if is_crypto_relevant(text_lower, symbol, lowered=True):
+            desc = _strip_tags(summary)
+            stories.append((
+                title if title else "No title",
+                "Crypto Feed",
+                entry_link,
+                entry.get("published", ""),
+                _truncate(desc),
+            ))
+    
+    return stories
+
+async def collect_news(symbol: str, num_stories: int) -> list:
+    """
+    Query all news sources concurrently and merge their stories in source priority order.
+    """
+    seen_hashes: set[int] = set()
+    clean_symbol = symbol.replace('-', ' ')
     
     search_variants = [
         f"{clean_symbol} cryptocurrency price news",
         f"{clean_symbol} crypto token news",
         f"{symbol} blockchain price",
     ]
+    # Google News RSS understands boolean OR, so one request covers every variant.
+    google_query = " OR ".join(f"({q})" for q in search_variants)
 
-    try:
-        for q in search_variants:
-            if len(stories) >= num_stories:
-                break
+    sources = [("Google News", fetch_google_news(google_query, symbol, num_stories))]
+    if NEWSAPI_API_KEY:
+        sources.append(("NewsAPI", fetch_newsapi(symbol, num_stories)))
+    sources.append(("Bing News", fetch_bing_news(symbol, num_stories)))
+    sources.extend((feed_url, fetch_crypto_feed(feed_url, symbol, num_stories)) for feed_url in crypto_feeds)
 
-            try:
-                feed = feedparser.parse(f'https://news.google.com/rss/search?q={q}&hl=en&gl=US&ceid=US:en')
-                
-                if not feed or not hasattr(feed, 'entries'):
-                    continue
-                
-                for entry in feed.entries[:num_stories * 4]:  
-                    if len(stories) >= num_stories:
-                        break
-
-                    url = entry.get("link")
-                    if not url or url in seen_urls:
-                        continue
-
-                    title = entry.get("title", "No title")
-                    source = "Google News"
-                    if " - " in title:
-                        parts = title.rsplit(" - ", 1)
-                        if len(parts) == 2:
-                            title, source = parts
-
-                    desc = re.sub("<[^<]+?>", "", entry.get("summary", title))
-                    
-                    combined_text = f"{title} {desc}"
-                    if not is_crypto_relevant(combined_text, symbol):
-                        logger.debug(f"Filtered out: {title[:50]}... (not crypto-relevant)")
-                        continue
-                    
-                    if len(desc) > 200:
-                        desc = desc[:200] + "..."
-                    
-                    stories.append({
-                        "title": title,
-                        "source": source,
-                        "url": url,
-                        "published_at": entry.get("published", ""),
-                        "description": desc
-                    })
-                    seen_urls.add(url)
-                    logger.debug(f"Added: {title[:50]}...")
-                
-                if stories:
-                    break
-            except Exception as e:
-                logger.error(f"Google News error: {e}")
-                continue
-    except Exception as e:
-        logger.error(f"Google News outer error: {e}")
-        pass
-
-    if len(stories) < num_stories and NEWSAPI_API_KEY:
-        try:
-            q = f'"{symbol}" (cryptocurrency OR crypto OR blockchain OR token)'
-            url = (f"https://newsapi.org/v2/everything?"
-                   f"q={q}&sortBy=publishedAt&language=en&pageSize=30&apiKey={NEWSAPI_API_KEY}")
-            
-            resp = requests.get(url, timeout=10)
-            if resp.status_code == 200:
-                articles = resp.json().get("articles", [])
-                for art in articles:
-                    if len(stories) >= num_stories:
-                        break
-                    
-                    article_url = art.get("url")
-                    if not article_url or article_url in seen_urls:
-                        continue
-                    
-                    desc = art.get("description", "")
-                    combined_text = f"{art.get('title', '')} {desc}"
-                    
-                    if not is_crypto_relevant(combined_text, symbol):
-                        continue
-                    
-                    if desc and len(desc) > 200:
-                        desc = desc[:200] + "..."
-                    
-                    stories.append({
-                        "title": art.get("title", "No title"),
-                        "source": art.get("source", {}).get("name", "NewsAPI"),
-                        "url": article_url,
-                        "published_at": art.get("publishedAt", ""),
-                        "description": desc if desc else ""
-                    })
-                    seen_urls.add(article_url)
-        except Exception as e:
-            logger.error(f"NewsAPI error: {e}")
-            pass
+    # Sources are consumed as they finish, ranked Google > NewsAPI > Bing > feeds. The rest
+    # are cancelled only once no pending source could place a story in the top num_stories.
+    tasks = {asyncio.create_task(coro): (priority, name) for priority, (name, coro) in enumerate(sources)}
+    pending = set(tasks)
+    ranked = []
 
-    if len(stories) < num_stories:
-        try:
-            bing_url = f"https://www.bing.com/news/search?q={symbol}+cryptocurrency&format=rss"
-            feed = feedparser.parse(bing_url)
-            
-            if feed and hasattr(feed, 'entries'):
-                for entry in feed.entries[:num_stories * 4]:
-                    if len(stories) >= num_stories:
-                        break
-                    
-                    url = entry.get("link")
-                    if not url or url in seen_urls:
-                        continue
-                    
-                    title = entry.get("title", "No title")
-                    desc = re.sub("<[^<]+?>", "", entry.get("summary", ""))
-                    
-                    combined_text = f"{title} {desc}"
-                    if not is_crypto_relevant(combined_text, symbol):
-                        continue
-                    
-                    if len(desc) > 200:
-                        desc = desc[:200] + "..."
-                    
-                    stories.append({
-                        "title": title,
-                        "source": "Bing News",
-                        "url": url,
-                        "published_at": entry.get("published", ""),
-                        "description": desc
-                    })
-                    seen_urls.add(url)
-        except Exception as e:
-            logger.error(f"Bing News error: {e}")
-            pass
-
-    if len(stories) < num_stories:
-        crypto_feeds = [
-            "https://cointelegraph.com/rss",
-            "https://news.bitcoin.com/feed/",
-            "https://cryptonews.net/en/news/feed/",
-            "https://www.coindesk.com/arc/outboundfeeds/rss/"
-        ]
-        
-        for feed_url in crypto_feeds:
-            if len(stories) >= num_stories:
-                break
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
             
-            try:
-                feed = feedparser.parse(feed_url)
-                
-                if not feed or not hasattr(feed, 'entries'):
+            for task in done:
+                priority, name = tasks[task]
+                if task.exception() is not None:
+                    logger.error(f"{name} error: {task.exception()}")
                     continue
                 
-                for entry in feed.entries[:num_stories * 5]:
-                    if len(stories) >= num_stories:
-                        break
-                    
-                    entry_link = entry.get("link")
-                    if not entry_link or entry_link in seen_urls:
+                for story in task.result():
+                    seen_count = len(seen_hashes)
+                    seen_hashes.add(hash(story[2]))
+                    if len(seen_hashes) == seen_count:
                         continue
-                    
-                    title = entry.get('title', '')
-                    summary = entry.get('summary', '')
-                    text = f"{title} {summary}"
-                    
-                    if is_crypto_relevant(text, symbol):
-                        desc = re.sub("<[^<]+?>", "", summary)
-                        if len(desc) > 200:
-                            desc = desc[:200] + "..."
-                        
-                        stories.append({
-                            "title": title if title else "No title",
-                            "source": "Crypto Feed",
-                            "url": entry_link,
-                            "published_at": entry.get("published", ""),
-                            "description": desc
-                        })
-                        seen_urls.add(entry_link)
-            except Exception as e:
-                logger.error(f"Crypto feed error: {e}")
-                continue
+                    ranked.append((priority, story))
+                    logger.debug(f"Added: {story[0][:50]}...")
+            
+            ranked.sort(key=lambda item: item[0])
+            if len(ranked) >= num_stories and pending and min(tasks[task][0] for task in pending) > ranked[num_stories - 1][0]:
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+
+    return [story for _, story in ranked[:num_stories]]
+
+async def get_crypto_news(symbol: str, num_stories: int = 3) -> str:
+    """
+    Fetch latest crypto news with advanced relevance filtering to avoid false positives.
+    """
+    cache_key = f"news:{symbol.lower()}:{num_stories}"
+    # The agent fills num_stories in itself; anything below one gets the no-news reply
+    # rather than reaching the sources.
+    stories = _news_cache.get(cache_key) if num_stories >= 1 else []
+    if stories is None:
+        cached = await cache_get(cache_key)
+        if cached:
+            stories = orjson.loads(cached)
+        else:
+            stories = await collect_news(symbol, num_stories)
+            if stories:
+                await cache_set(cache_key, 300, orjson.dumps(stories))
+        if stories:
+            _news_cache[cache_key] = stories
 
     if not stories:
-        return json.dumps({
+        return orjson.dumps({
             "symbol": symbol.upper(),
             "news": [],
             "count": 0,
             "message": f"No recent crypto news found for {symbol}. It might have limited media coverage or be a very new project.",
-            "timestamp": datetime.now().isoformat()
-        })
+            "timestamp": _now_iso()
+        }).decode()
 
     logger.info(f"Found {len(stories)} relevant articles for {symbol}")
     
-    return json.dumps({
+    return orjson.dumps({
         "symbol": symbol.upper(),
         "news": stories,
         "count": len(stories),
-        "timestamp": datetime.now().isoformat()
-    })
+        "timestamp": _now_iso()
+    }).decode()
 
 instructions = """
 You are a Crypto Intelligence Agent with persistent memory.
 
 TOOLS AVAILABLE:
 - get_crypto_price(symbol): Fetches current USD price from CoinGecko  
+- get_crypto_prices(symbols): Fetches current USD prices for several cryptos from CoinGecko in a single call
 - update_user_memory: Ability to store/retrieve user-specific data from database. Use it to store the price you've just fetched.
-- get_crypto_news(symbol, num_stories): Fetches recent news from Google News, NewsAPI, Bing News, and crypto feeds
+- get_crypto_news(symbol, num_stories): Fetches recent news from Google News, NewsAPI, Bing News, and crypto feeds.
+  Each item in "news" is a list: [title, source, url, published_at, description]
 
 WORKFLOW:
-1. Call get_crypto_price(symbol) once
+1. Call get_crypto_price(symbol) once (when the user asks about several cryptos, call get_crypto_prices(symbols) once with all of them instead)
 2. ALWAYS Call update_user_memory to store the price
 3. Call get_crypto_news(symbol, num_stories=3) once
 4. Format and present the COMPLETE response to the user with price and news
@@ -455,35 +897,29 @@ IMPORTANT:
 
 crypto_agent = Agent(
     name="CryptoIntel",
-    model=Gemini(id='gemini-2.5-flash', api_key=GOOGLE_API_KEY),
+    model=GEMINI_FLASH,
     instructions=instructions,
-    tools=[get_crypto_price, get_crypto_news],
+    tools=[get_crypto_price, get_crypto_prices, get_crypto_news],
     memory_manager=memory_manager,
     db=storage,
     enable_agentic_memory=True,
     enable_user_memories=True,
     markdown=True,
     debug_mode=True,
-    stream=False,
+    stream=True,
 )
 crypto_agent_pro = Agent(
     name="CryptoIntelPro",
-    model=Gemini(
-        id='gemini-2.5-pro', 
-        api_key=GOOGLE_API_KEY,
-        temperature=0.1, 
-        top_p=0.8,
-        stop_sequences=["---END---", "\n\nIs there"],
-    ),
+    model=GEMINI_PRO,
     instructions=instructions,
-    tools=[get_crypto_price, get_crypto_news],
+    tools=[get_crypto_price, get_crypto_prices, get_crypto_news],
     memory_manager=memory_manager,
     db=storage,
     enable_agentic_memory=True,
     enable_user_memories=True,
     markdown=True,
     debug_mode=True,
-    stream=False,
+    stream=True,
 )
 agent_os = AgentOS(
     os_id="Crypto-Intelligence-Hub",
@@ -492,17 +928,48 @@ agent_os = AgentOS(
 
 app = agent_os.get_app()
 
+ALLOWED_ORIGINS = (
+    "https://crypto-intelligence-agent.vercel.app",
+    "http://localhost:3000",
+)
+
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[
-        "https://crypto-intelligence-agent.vercel.app",
-        "http://localhost:3000",
-        "*" 
-    ],
+    allow_origins=list(ALLOWED_ORIGINS),
     allow_credentials=True,
-    allow_methods=["*"],
+    # DELETE is used by the frontend's session removal.
+    allow_methods=["GET", "POST", "DELETE", "OPTIONS"],
     allow_headers=["*"],
 )
 
+@app.on_event("shutdown")
+async def close_http_client():
+    await HTTP.aclose()
+
+@app.on_event("shutdown")
+async def close_redis():
+    if redis_client is not None:
+        await redis_client.aclose()
+
+@app.on_event("shutdown")
+async def close_db_pool():
+    db_engine.dispose()
+
+@app.on_event("shutdown")
+async def close_feed_executor():
+    _FEED_EXECUTOR.shutdown(wait=False)
+
 if __name__ == "__main__":
-    agent_os.serve(app="IntelligenceHub:app", reload=True, host="0.0.0.0", port=int(os.getenv("PORT",1111)))
\ No newline at end of file
+    if os.getenv("ENV") == "prod":
+        uvicorn.run(
+            "IntelligenceHub:app",
+            host="0.0.0.0",
+            port=int(os.getenv("PORT",1111)),
+            loop="auto",  # uvloop where installed (not on Windows)
+            http="httptools",
+            workers=int(os.getenv("WORKERS") or os.getenv("WEB_CONCURRENCY") or os.cpu_count()),
+            reload=False,
+            access_log=False,
+        )
+    else:
+        agent_os.serve(app="IntelligenceHub:app", reload=True, host="0.0.0.0", port=int(os.getenv("PORT",1111)))
\ No newline at end of file